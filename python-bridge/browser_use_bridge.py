@@ -19,47 +19,109 @@ Features:
 """
 
 import asyncio
+import hashlib
 import json
 import sys
 import os
 import logging
-from typing import Dict, Any, List
+import queue
+import re
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-# Fix Windows Unicode encoding issues
+# Fix Windows Unicode encoding issues. reconfigure keeps CPython's C-level
+# TextIOWrapper fast path (the old codecs.StreamWriter wrapper encoded every
+# write in Python code) and errors='replace' absorbs legacy console encodings.
+sys.stdout.reconfigure(encoding='utf-8', errors='replace', write_through=True)
+sys.stderr.reconfigure(encoding='utf-8', errors='replace', write_through=True)
 if sys.platform == "win32":
-    import codecs
-    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.detach())
-    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.detach())
-    # Set console encoding to UTF-8
     os.environ['PYTHONIOENCODING'] = 'utf-8'
+_stdout_buffer = sys.stdout.buffer
+
+# Binary IPC framing: length-prefixed msgpack frames are much cheaper to
+# encode/decode than JSON lines for chatty agent traces and screenshot
+# payloads. BRIDGE_IPC=json forces the old JSON-lines protocol (debugging,
+# or environments without the msgpack wheel).
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+USE_MSGPACK = msgpack is not None and os.getenv('BRIDGE_IPC', 'msgpack') != 'json'
+
+# If Node explicitly negotiated msgpack framing, silently falling back to
+# JSON lines would desynchronize the stream (the peer reads our output as
+# length prefixes), so refuse to start instead of hanging the handshake.
+if os.getenv('BRIDGE_IPC') == 'msgpack' and msgpack is None:
+    sys.stderr.write(
+        "browser_use_bridge: BRIDGE_IPC=msgpack but the msgpack package "
+        "is not installed\n"
+    )
+    sys.exit(1)
+
+
+def _emit_startup_error(message: str) -> None:
+    """Report a fatal startup error in the negotiated framing.
+
+    A bare JSON print would be misread by a Node side already in msgpack
+    mode as a huge length prefix, and the actual error would be lost.
+    """
+    payload = {
+        "type": "error",
+        "message": message,
+        "timestamp": datetime.now().isoformat()
+    }
+    if USE_MSGPACK:
+        body = msgpack.packb(payload)
+        _stdout_buffer.write(len(body).to_bytes(4, 'little') + body)
+        _stdout_buffer.flush()
+    else:
+        print(json.dumps(payload), flush=True)
+
+# orjson encodes straight to UTF-8 bytes and parses bytes without an
+# intermediate str, several times faster than stdlib json. Used for the
+# JSON-lines fallback protocol; stdlib json remains the last resort.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx lets us share one pooled HTTP client across all LLM calls so TLS
+# handshakes are amortized across tasks instead of paid per request
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # Add the current directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Use uvloop (libuv-based event loop) when available for faster async I/O.
+# uvloop does not support Windows, and the bridge must still run without the
+# wheel installed, so fall through silently to the stdlib loop.
+if sys.platform != "win32":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
 try:
     from browser_use import Agent
     from browser_use.llm import ChatOpenAI
+    try:
+        from browser_use.llm import ChatAnthropic
+    except ImportError:
+        ChatAnthropic = None
     import dotenv
     dotenv.load_dotenv()
 except ImportError as e:
-    print(json.dumps({
-        "type": "error",
-        "message": f"Failed to import browser-use: {e}",
-        "timestamp": datetime.now().isoformat()
-    }))
+    _emit_startup_error(f"Failed to import browser-use: {e}")
     sys.exit(1)
 
-# Configure logging with Unicode support
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('browser_use_bridge.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stderr)
-    ]
-)
-
 # Set up Unicode-safe logging formatter
 class UnicodeFormatter(logging.Formatter):
     def format(self, record):
@@ -70,40 +132,162 @@ class UnicodeFormatter(logging.Formatter):
             record.msg = str(record.msg).encode('ascii', 'replace').decode('ascii')
             return super().format(record)
 
-# Apply Unicode formatter to all handlers
-for handler in logging.getLogger().handlers:
-    handler.setFormatter(UnicodeFormatter('%(asctime)s - %(levelname)s - %(message)s'))
+# Route logging through a queue so formatting and file/stderr writes happen
+# on a background thread instead of blocking the event loop between awaits
+_log_queue = queue.Queue(-1)
+_log_handlers = [
+    logging.FileHandler('browser_use_bridge.log', encoding='utf-8'),
+    logging.StreamHandler(sys.stderr)
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(UnicodeFormatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_listener = QueueListener(_log_queue, *_log_handlers)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
+# Static instruction block prepended to every task. Built once at import so
+# enhance_task_description is a single f-string allocation per call, and the
+# prompt prefix stays byte-identical for provider-side caching.
+_RULES = (
+    "ACTION-FOCUSED RULES:"
+    "\n- TAKE IMMEDIATE ACTION - don't spend time analyzing"
+    "\n- Click Accept on any cookie popups (5 seconds max)"
+    "\n- Find form fields quickly by their labels"
+    "\n- Type airport codes immediately when you find the right field"
+    "\n- Click dropdown options immediately when they appear"
+    "\n- If stuck on any element for >10 seconds, move to next step"
+    "\n- If you see bot detection/CAPTCHA, stop immediately"
+    "\n- SPEED IS CRITICAL - don't overthink, just execute"
+)
+
+# Markers of bot detection in error messages, compiled once so the error
+# path does a single case-insensitive scan instead of lowercasing the
+# message and looping over keywords
+_BOT_RE = re.compile(r"captcha|bot|verification|challenge|blocked", re.IGNORECASE)
+
+def _encode_fallback(obj):
+    """Serializer default hook for browser-use objects (actions, steps):
+    emit their attribute dict directly instead of a pre-rendered repr"""
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    return str(obj)
+
+class TaskResultCache:
+    """
+    Disk-backed cache of processed task results keyed by task + URL + model.
+    Repeated runs of an identical task skip the full agent loop (and its LLM
+    cost) entirely. Entries expire after ttl_seconds.
+    """
+
+    def __init__(self, cache_dir: str = "cache", ttl_seconds: int = 3600):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not create task cache directory: {e}")
+
+    def make_key(self, task: str, url: str, model: str) -> str:
+        payload = json.dumps({"task": task, "url": url, "model": model}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, default=_encode_fallback)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to write task cache entry: {e}")
+
 class BrowserUseBridge:
     """
     Bridge class that handles communication between Node.js and browser-use
     """
-    
+
     def __init__(self):
         self.agent = None
         self.llm = None
+        self.llm_model = None
+        self.cache = TaskResultCache()
+        self._ts_cache = (0.0, "")
+        self._http = None
+        self._out_buf = bytearray()
+        self._flush_scheduled = False
+        # Static control messages framed once up front; ready/pong become a
+        # single buffered write with no per-call serialization. They carry
+        # no timestamp - Node stamps on receive.
+        self._ready_bytes = self._encode_static({"type": "ready", "message": "Browser-use bridge is ready"})
+        self._pong_bytes = self._encode_static({"type": "pong", "message": "Bridge is alive"})
         self.initialize_llm()
+
+    @staticmethod
+    def _encode_static(message: Dict[str, Any]) -> bytes:
+        """Frame a static control message for the active IPC mode"""
+        if USE_MSGPACK:
+            buf = msgpack.packb(message, use_bin_type=True)
+            return len(buf).to_bytes(4, 'little') + buf
+        if orjson is not None:
+            return orjson.dumps(message) + b'\n'
+        return json.dumps(message).encode('utf-8') + b'\n'
+
+    def send_raw(self, frame: bytes):
+        """Write a pre-encoded frame, skipping timestamping and serialization"""
+        self._write_out(frame)
     
     def initialize_llm(self):
         """Initialize the LLM for browser-use"""
         try:
+            # Share one pooled HTTP client across every LLM call so TCP+TLS
+            # setup (~100-300ms) is paid once, not per task
+            if httpx is not None:
+                limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+                try:
+                    self._http = httpx.AsyncClient(http2=True, timeout=60.0, limits=limits)
+                except ImportError:
+                    # h2 extra not installed; keep-alive pooling still applies
+                    self._http = httpx.AsyncClient(timeout=60.0, limits=limits)
+
             # Try to use OpenAI first, fallback to other providers
             api_key = os.getenv('OPENAI_API_KEY')
             if api_key:
-                self.llm = ChatOpenAI(
-                    model="gpt-4o-mini",
-                    temperature=0.1,
-                    api_key=api_key
-                )
+                self.llm_model = "gpt-4o-mini"
+                llm_kwargs = {
+                    "model": self.llm_model,
+                    "temperature": 0.1,
+                    "api_key": api_key
+                }
+                if self._http is not None:
+                    try:
+                        self.llm = ChatOpenAI(http_client=self._http, **llm_kwargs)
+                    except TypeError:
+                        # browser-use wrapper without http_client passthrough
+                        self.llm = ChatOpenAI(**llm_kwargs)
+                else:
+                    self.llm = ChatOpenAI(**llm_kwargs)
                 logger.info("Initialized OpenAI LLM")
             else:
                 # Try other providers
                 anthropic_key = os.getenv('ANTHROPIC_API_KEY')
                 if anthropic_key:
-                    from browser_use.llm import ChatAnthropic
+                    if ChatAnthropic is None:
+                        raise Exception("ChatAnthropic is not available in this browser-use install")
+                    self.llm_model = "claude-3-sonnet-20240229"
                     self.llm = ChatAnthropic(
-                        model="claude-3-sonnet-20240229",
+                        model=self.llm_model,
                         api_key=anthropic_key
                     )
                     logger.info("Initialized Anthropic LLM")
@@ -117,11 +301,74 @@ class BrowserUseBridge:
                 "message": f"Failed to initialize LLM: {e}"
             })
     
+    def _write_out(self, data: bytes):
+        """Queue outbound bytes and coalesce messages sent in the same loop
+        tick into a single write syscall"""
+        self._out_buf += data
+        if len(self._out_buf) >= 65536:
+            # Large payload (screenshots): don't sit on the buffer
+            self._flush_out()
+            return
+        if not self._flush_scheduled:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No loop yet (startup errors): write immediately
+                self._flush_out()
+                return
+            self._flush_scheduled = True
+            loop.call_soon(self._flush_out)
+
+    def _flush_out(self):
+        self._flush_scheduled = False
+        if not self._out_buf:
+            return
+        _stdout_buffer.write(bytes(self._out_buf))
+        _stdout_buffer.flush()
+        self._out_buf.clear()
+
+    def send_blob(self, blob: bytes, mime: str = "image/png") -> str:
+        """Send raw bytes as a blob header frame plus a raw data frame,
+        returning the id the control message should reference"""
+        blob_id = uuid.uuid4().hex
+        header = msgpack.packb(
+            {"type": "blob", "id": blob_id, "mime": mime, "len": len(blob)},
+            use_bin_type=True
+        )
+        self._write_out(len(header).to_bytes(4, 'little') + header)
+        self._write_out(len(blob).to_bytes(4, 'little') + blob)
+        return blob_id
+
+    def encode_screenshots(self, screenshots) -> List[Any]:
+        """In binary IPC mode ship screenshot bytes as raw blob frames and
+        keep only their ids in the result; base64-in-JSON otherwise"""
+        if not USE_MSGPACK:
+            return list(screenshots)
+        encoded = []
+        for shot in screenshots:
+            if isinstance(shot, (bytes, bytearray, memoryview)):
+                encoded.append(self.send_blob(bytes(shot)))
+            else:
+                encoded.append(shot)
+        return encoded
+
     def send_response(self, response: Dict[str, Any]):
-        """Send JSON response to Node.js"""
+        """Send a response message to Node.js"""
         try:
-            response["timestamp"] = datetime.now().isoformat()
-            print(json.dumps(response), flush=True)
+            # Memoize the ISO timestamp at ~1ms granularity; building a
+            # datetime and formatting it per message adds up on chatty
+            # progress streams
+            now = time.time()
+            if now - self._ts_cache[0] > 0.001:
+                self._ts_cache = (now, datetime.fromtimestamp(now).isoformat())
+            response["timestamp"] = self._ts_cache[1]
+            if USE_MSGPACK:
+                buf = msgpack.packb(response, use_bin_type=True, default=_encode_fallback)
+                self._write_out(len(buf).to_bytes(4, 'little') + buf)
+            elif orjson is not None:
+                self._write_out(orjson.dumps(response, default=_encode_fallback) + b'\n')
+            else:
+                print(json.dumps(response, default=_encode_fallback), flush=True)
         except Exception as e:
             logger.error(f"Failed to send response: {e}")
     
@@ -137,7 +384,20 @@ class BrowserUseBridge:
             
             # Create enhanced task description
             enhanced_task = self.enhance_task_description(task_description, url)
-            
+
+            # Identical task + URL + model within the TTL: return the prior
+            # result without spinning up the agent at all
+            cache_key = self.cache.make_key(enhanced_task, url, self.llm_model or "")
+            cached_result = self.cache.get(cache_key)
+            if cached_result is not None:
+                logger.info("Task cache hit, skipping agent run")
+                self.send_response({
+                    "type": "success",
+                    "data": cached_result,
+                    "cache": "hit"
+                })
+                return
+
             logger.info(f"Executing task with {timeout}s timeout")
             logger.info(f"Task preview: {enhanced_task[:300]}...")
             
@@ -155,21 +415,39 @@ class BrowserUseBridge:
             try:
                 # Use the exact timeout provided, with a reasonable maximum
                 actual_timeout = min(timeout, 90)  # Cap at 90 seconds
-                
-                result = await asyncio.wait_for(
-                    self.agent.run(), 
-                    timeout=actual_timeout
-                )
+
+                # Stream per-step progress so Node.js can render activity
+                # instead of waiting in silence for the final result
+                try:
+                    run_coro = self.agent.run(on_step_end=self.send_step_progress)
+                except TypeError:
+                    # Older browser-use versions without step hooks
+                    logger.info("Agent.run has no step hooks, progress streaming disabled")
+                    run_coro = self.agent.run()
+
+                # asyncio.timeout (3.11+) uses the loop's native timer
+                # instead of wrapping the long-lived run coroutine in an
+                # extra Task the way wait_for does, and cancels subtasks
+                # more cleanly
+                if hasattr(asyncio, 'timeout'):
+                    async with asyncio.timeout(actual_timeout):
+                        result = await run_coro
+                else:
+                    result = await asyncio.wait_for(run_coro, timeout=actual_timeout)
                 
                 # Process and return results
                 processed_result = self.process_result(result)
-                
+
+                if processed_result.get("success"):
+                    # Screenshots are ephemeral blob references, don't cache them
+                    self.cache.set(cache_key, {**processed_result, "screenshots": []})
+
                 self.send_response({
                     "type": "success",
                     "data": processed_result
                 })
                 
-            except asyncio.TimeoutError:
+            except (TimeoutError, asyncio.TimeoutError):
                 logger.warning(f"Task timed out after {actual_timeout} seconds")
                 self.send_response({
                     "type": "error",
@@ -180,8 +458,7 @@ class BrowserUseBridge:
             logger.error(f"Task execution failed: {e}")
             
             # Check if it's a bot detection related error
-            error_msg = str(e).lower()
-            if any(keyword in error_msg for keyword in ['captcha', 'bot', 'verification', 'challenge', 'blocked']):
+            if _BOT_RE.search(str(e)):
                 self.send_response({
                     "type": "error",
                     "message": f"Bot detection encountered: {str(e)}"
@@ -192,26 +469,25 @@ class BrowserUseBridge:
                     "message": str(e)
                 })
     
+    async def send_step_progress(self, agent):
+        """Step hook: report each completed agent step back to Node.js"""
+        try:
+            state = getattr(agent, 'state', None)
+            step = getattr(state, 'n_steps', None)
+            self.send_response({
+                "type": "progress",
+                "data": {"step": step}
+            })
+        except Exception as e:
+            logger.warning(f"Failed to send step progress: {e}")
+
     def enhance_task_description(self, task: str, url: str = "") -> str:
         """Enhance the task description with specific instructions for better automation"""
-        enhanced_task = task
-        
-        # Add URL navigation if provided
+        # Static rules first (stable prefix for provider-side prompt
+        # caching), then the variable URL/task tail - one allocation total
         if url:
-            enhanced_task = f"Navigate to {url} and then complete this task:\n\n{task}"
-        
-        # Add comprehensive instructions for better automation
-        enhanced_task += "\n\nACTION-FOCUSED RULES:"
-        enhanced_task += "\n- TAKE IMMEDIATE ACTION - don't spend time analyzing"
-        enhanced_task += "\n- Click Accept on any cookie popups (5 seconds max)"
-        enhanced_task += "\n- Find form fields quickly by their labels"
-        enhanced_task += "\n- Type airport codes immediately when you find the right field"
-        enhanced_task += "\n- Click dropdown options immediately when they appear"
-        enhanced_task += "\n- If stuck on any element for >10 seconds, move to next step"
-        enhanced_task += "\n- If you see bot detection/CAPTCHA, stop immediately"
-        enhanced_task += "\n- SPEED IS CRITICAL - don't overthink, just execute"
-        
-        return enhanced_task
+            return f"{_RULES}\n\nNavigate to {url} and then complete this task:\n\n{task}"
+        return f"{_RULES}\n\n{task}"
     
     def process_result(self, result) -> Dict[str, Any]:
         """Process browser-use result into a format suitable for Node.js"""
@@ -224,15 +500,17 @@ class BrowserUseBridge:
                 "extracted_data": []
             }
             
-            # Extract information from browser-use result
+            # Extract information from browser-use result. Actions are kept
+            # as-is; the serializer's default hook renders them on encode,
+            # so no per-action str()/repr work happens here
             if hasattr(result, 'actions'):
-                processed["actions_taken"] = [str(action) for action in result.actions]
+                processed["actions_taken"] = list(result.actions)
             
             if hasattr(result, 'final_url'):
                 processed["final_state"]["url"] = result.final_url
             
             if hasattr(result, 'screenshots'):
-                processed["screenshots"] = result.screenshots
+                processed["screenshots"] = self.encode_screenshots(result.screenshots)
             
             # Add any extracted text or data
             if hasattr(result, 'extracted_content'):
@@ -248,7 +526,11 @@ class BrowserUseBridge:
                 "raw_result": str(result)
             }
     
-    async def test_connection(self):
+    async def pong(self, data: Dict[str, Any]):
+        """Respond to a keepalive ping"""
+        self.send_raw(self._pong_bytes)
+
+    async def test_connection(self, data: Dict[str, Any] = None):
         """Test the browser-use setup"""
         try:
             logger.info("Testing browser-use connection...")
@@ -273,23 +555,28 @@ class BrowserUseBridge:
                 "message": f"Browser-use test failed: {e}"
             })
     
+    # O(1) dispatch table; new message types only need an entry here
+    _HANDLERS = {
+        'execute_task': execute_task,
+        'test': test_connection,
+        'ping': pong
+    }
+
     async def handle_message(self, message: Dict[str, Any]):
         """Handle incoming messages from Node.js"""
         try:
             message_type = message.get('type', '')
-            
-            if message_type == 'execute_task':
-                await self.execute_task(message.get('data', {}))
-            elif message_type == 'test':
-                await self.test_connection()
-            elif message_type == 'ping':
-                self.send_response({"type": "pong", "message": "Bridge is alive"})
-            else:
+
+            handler = self._HANDLERS.get(message_type)
+            if handler is None:
                 self.send_response({
                     "type": "error",
                     "message": f"Unknown message type: {message_type}"
                 })
-                
+                return
+
+            await handler(self, message.get('data', {}))
+
         except Exception as e:
             logger.error(f"Message handling failed: {e}")
             self.send_response({
@@ -297,30 +584,101 @@ class BrowserUseBridge:
                 "message": f"Message handling failed: {e}"
             })
     
+    async def connect_stdin(self, loop) -> asyncio.StreamReader:
+        """Attach an asyncio StreamReader to stdin for non-blocking reads"""
+        reader = asyncio.StreamReader()
+        protocol = asyncio.StreamReaderProtocol(reader)
+        await loop.connect_read_pipe(lambda: protocol, sys.stdin)
+        return reader
+
+    async def read_exactly(self, reader, loop, n: int) -> bytes:
+        """Read exactly n bytes from stdin (StreamReader or executor fallback)"""
+        if reader is not None:
+            return await reader.readexactly(n)
+        data = b''
+        while len(data) < n:
+            chunk = await loop.run_in_executor(None, sys.stdin.buffer.read, n - len(data))
+            if not chunk:
+                raise asyncio.IncompleteReadError(data, n)
+            data += chunk
+        return data
+
+    async def read_frame(self, reader, loop):
+        """Read one length-prefixed msgpack frame; None when stdin closes"""
+        try:
+            header = await self.read_exactly(reader, loop, 4)
+            length = int.from_bytes(header, 'little')
+            if reader is not None and length > 65536:
+                # Large frame (batch execute, replay log): feed the
+                # streaming unpacker chunk by chunk so decoding overlaps
+                # with pipe arrival instead of waiting for the full payload
+                unpacker = msgpack.Unpacker(raw=False, max_buffer_size=length)
+                remaining = length
+                while remaining > 0:
+                    chunk = await reader.read(min(remaining, 65536))
+                    if not chunk:
+                        raise asyncio.IncompleteReadError(b'', remaining)
+                    remaining -= len(chunk)
+                    unpacker.feed(chunk)
+                return next(unpacker, None)
+            payload = await self.read_exactly(reader, loop, length)
+        except asyncio.IncompleteReadError:
+            return None
+        return msgpack.unpackb(payload, raw=False)
+
     async def run(self):
         """Main loop to handle messages from Node.js"""
         logger.info("Browser-use bridge started")
+
+        # Eager tasks (Python 3.12+) run coroutines inline until their first
+        # real suspension, skipping a scheduler round-trip for awaits that
+        # complete synchronously (immediate errors, cached responses).
+        loop = asyncio.get_running_loop()
+        if hasattr(asyncio, "eager_task_factory"):
+            loop.set_task_factory(asyncio.eager_task_factory)
         
         # Send ready signal
-        self.send_response({
-            "type": "ready",
-            "message": "Browser-use bridge is ready"
-        })
+        self.send_raw(self._ready_bytes)
         
         try:
-            # Read messages from stdin
+            # Read messages from stdin without blocking the event loop, so
+            # timers and in-flight agent I/O keep running during long reads
+            try:
+                reader = await self.connect_stdin(loop)
+            except (NotImplementedError, OSError):
+                # connect_read_pipe doesn't support Windows console pipes;
+                # fall back to blocking reads on a worker thread
+                reader = None
+
             while True:
                 try:
-                    line = input()
-                    if not line.strip():
-                        continue
-                    
-                    message = json.loads(line)
+                    if USE_MSGPACK:
+                        message = await self.read_frame(reader, loop)
+                        if message is None:
+                            logger.info("Input stream closed, exiting")
+                            break
+                    else:
+                        if reader is not None:
+                            raw = await reader.readline()
+                        else:
+                            raw = await loop.run_in_executor(None, sys.stdin.readline)
+
+                        if not raw:
+                            logger.info("Input stream closed, exiting")
+                            break
+
+                        if not raw.strip():
+                            continue
+
+                        if orjson is not None:
+                            # orjson parses bytes directly, no decode step
+                            message = orjson.loads(raw)
+                        else:
+                            line = raw.decode('utf-8') if isinstance(raw, bytes) else raw
+                            message = json.loads(line)
+
                     await self.handle_message(message)
-                    
-                except EOFError:
-                    logger.info("Input stream closed, exiting")
-                    break
+
                 except json.JSONDecodeError as e:
                     logger.error(f"Invalid JSON received: {e}")
                     self.send_response({
@@ -339,12 +697,18 @@ class BrowserUseBridge:
         except Exception as e:
             logger.error(f"Bridge crashed: {e}")
         finally:
+            if self._http is not None:
+                await self._http.aclose()
             logger.info("Browser-use bridge shutting down")
 
 async def main():
     """Main entry point"""
-    bridge = BrowserUseBridge()
-    await bridge.run()
+    log_listener.start()
+    try:
+        bridge = BrowserUseBridge()
+        await bridge.run()
+    finally:
+        log_listener.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -8,69 +8,48 @@ Integrates with JavaScript field detection engine
 
 import asyncio
 import json
+import re
+import weakref
 from typing import Dict, List, Optional, Any
 from playwright.async_api import Page, Browser
 import logging
 
 logger = logging.getLogger(__name__)
 
-class EnhancedBrowserAutomation:
-    def __init__(self):
-        self.detected_fields = []
-        self.field_mappings = {}
-        self.detection_enabled = True
-        
-    async def detect_and_highlight_fields(self, page: Page) -> List[Dict]:
-        """Detect all fields on the page and highlight them"""
-        
-        try:
-            # Inject field detection scripts
-            await self.inject_field_detection_scripts(page)
-            
-            # Detect fields using the enhanced system
-            detected_fields = await page.evaluate("""
-                async () => {
-                    if (!window.DynamicFieldDetector || !window.FieldHighlighter) {
-                        throw new Error('Field detection scripts not loaded');
-                    }
-                    
-                    const detector = new window.DynamicFieldDetector();
-                    const highlighter = new window.FieldHighlighter();
-                    
-                    const fields = await detector.detectAllFields();
-                    highlighter.highlightFields(fields);
-                    
-                    // Return serializable field data
-                    return fields.map(field => ({
-                        id: field.id,
-                        semantic: field.semantic,
-                        score: field.score,
-                        attributes: field.attributes,
-                        context: field.context,
-                        rect: {
-                            x: field.rect.x,
-                            y: field.rect.y,
-                            width: field.rect.width,
-                            height: field.rect.height
-                        }
-                    }));
-                }
-            """)
-            
-            self.detected_fields = detected_fields
-            logger.info(f"Detected {len(detected_fields)} fields on page")
-            return detected_fields
-            
-        except Exception as e:
-            logger.error(f"Field detection failed: {e}")
-            return []
-    
-    async def inject_field_detection_scripts(self, page: Page):
-        """Inject the field detection and highlighting JavaScript"""
-        
-        try:
-            # Field Detection Script
-            field_detection_script = """
+# Fills a batch of pre-resolved fields in one JS turn; mirrors the
+# single-field strategy in fill_field_by_semantic_type
+_BATCH_FILL_JS = """
+    (items) => items.map(({ field, value }) => {
+        // The detector stashed live element references by field id; the
+        // attribute queries below are only a fallback for stale refs
+        let element = (window.__fieldRefs && window.__fieldRefs.get(field.id)) || null;
+
+        if (!element && field.attributes.id) {
+            element = document.getElementById(field.attributes.id);
+        }
+
+        if (!element && field.attributes.name) {
+            element = document.querySelector(`[name="${field.attributes.name}"]`);
+        }
+
+        if (!element && field.attributes.placeholder) {
+            element = document.querySelector(`[placeholder="${field.attributes.placeholder}"]`);
+        }
+
+        if (element) {
+            element.focus();
+            element.value = value;
+            element.dispatchEvent(new Event('input', { bubbles: true }));
+            element.dispatchEvent(new Event('change', { bubbles: true }));
+            return true;
+        }
+        return false;
+    })
+"""
+
+# Field detection and highlighting JS, combined into one blob so it is
+# concatenated once at import and uploaded at most once per page
+_FIELD_DETECTION_JS = """
             class DynamicFieldDetector {
                 constructor() {
                     this.fieldSelectors = [
@@ -79,58 +58,108 @@ class EnhancedBrowserAutomation:
                         'input[type="number"]', 'input[type="date"]', 'input:not([type])',
                         'textarea', 'select', '[contenteditable="true"]'
                     ];
-                    this.semanticPatterns = {
-                        email: [/email/i, /e-mail/i, /mail/i],
-                        password: [/password/i, /pass/i, /pwd/i],
-                        name: [/name/i, /firstname/i, /lastname/i],
-                        departure: [/from/i, /departure/i, /origin/i, /depart/i],
-                        destination: [/to/i, /destination/i, /arrival/i, /arrive/i],
-                        date: [/date/i, /when/i, /departure/i],
-                        phone: [/phone/i, /tel/i, /mobile/i],
-                        address: [/address/i, /street/i, /city/i]
+                    // One alternation regex per semantic: a single pass over
+                    // the search text instead of up to four pattern tests
+                    this.semanticRegex = {
+                        email: /email|e-mail|mail/i,
+                        password: /password|pass|pwd/i,
+                        name: /name|firstname|lastname/i,
+                        departure: /from|departure|origin|depart/i,
+                        destination: /to|destination|arrival|arrive/i,
+                        date: /date|when|departure/i,
+                        phone: /phone|tel|mobile/i,
+                        address: /address|street|city/i
                     };
                 }
                 
-                async detectAllFields() {
+                detectAllFields() {
+                    // Synchronous: everything here is DOM reads, so callers
+                    // avoid a microtask hop per invocation. Reuses the last
+                    // result until the MutationObserver sees a change that
+                    // could affect fields
+                    const cache = window.__fieldCache ||
+                        (window.__fieldCache = { valid: false, fields: [] });
+                    if (cache.valid) return cache.fields;
+                    this.ensureObserver();
+
                     const fields = [];
                     let counter = 0;
-                    
-                    for (const selector of this.fieldSelectors) {
-                        const elements = document.querySelectorAll(selector);
-                        elements.forEach(element => {
-                            if (this.isVisible(element)) {
-                                const field = this.analyzeField(element, counter++);
-                                if (field) fields.push(field);
-                            }
-                        });
-                    }
-                    
-                    return this.rankFields(fields);
+                    this.nearbyTextCache = new Map();
+
+                    // One joined selector = one DOM traversal instead of
+                    // twelve, and no duplicate matches to filter out
+                    const elements = document.querySelectorAll(this.fieldSelectors.join(','));
+                    // Keep live element references by id so fills are a Map
+                    // lookup instead of re-querying the DOM
+                    const refs = window.__fieldRefs = new Map();
+                    // Flush any pending layout once so the rect reads below
+                    // all hit the clean layout cache
+                    document.body.getBoundingClientRect();
+                    elements.forEach(element => {
+                        // One layout read per element: reuse the rect for the
+                        // visibility gate and the field record, and skip the
+                        // style lookup entirely for zero-area elements
+                        const rect = element.getBoundingClientRect();
+                        if (rect.width === 0 || rect.height === 0) return;
+                        const style = window.getComputedStyle(element);
+                        if (style.display === 'none' || style.visibility === 'hidden') return;
+                        const field = this.analyzeField(element, rect, counter++);
+                        if (field) {
+                            refs.set(field.id, element);
+                            fields.push(field);
+                        }
+                    });
+
+                    cache.fields = this.rankFields(fields);
+                    cache.valid = true;
+                    return cache.fields;
                 }
-                
-                isVisible(element) {
-                    const rect = element.getBoundingClientRect();
-                    const style = window.getComputedStyle(element);
-                    return rect.width > 0 && rect.height > 0 && 
-                           style.display !== 'none' && style.visibility !== 'hidden';
+
+                ensureObserver() {
+                    if (window.__fieldObserver || !document.body) return;
+                    window.__fieldObserver = new MutationObserver(mutations => {
+                        // The highlighter mutates the observed subtree too;
+                        // its overlay must not invalidate the cache it was
+                        // just drawn from
+                        for (const mutation of mutations) {
+                            const target = mutation.target;
+                            if (target.id === 'mksk-hl-overlay' ||
+                                (target.closest && target.closest('#mksk-hl-overlay'))) {
+                                continue;
+                            }
+                            if (mutation.type === 'childList' &&
+                                [...mutation.addedNodes, ...mutation.removedNodes]
+                                    .every(node => node.id === 'mksk-hl-overlay')) {
+                                continue;
+                            }
+                            window.__fieldCache.valid = false;
+                            return;
+                        }
+                    });
+                    window.__fieldObserver.observe(document.body, {
+                        subtree: true,
+                        childList: true,
+                        attributes: true,
+                        attributeFilter: ['name', 'id', 'placeholder', 'type']
+                    });
                 }
                 
-                analyzeField(element, order) {
-                    const rect = element.getBoundingClientRect();
+                analyzeField(element, rect, order) {
                     const attributes = this.extractAttributes(element);
                     const context = this.analyzeContext(element);
                     const semantic = this.inferPurpose(element, attributes, context);
                     const score = this.calculateScore(attributes, context, semantic);
                     
+                    // Monotonic numeric id: no Date.now() call or template
+                    // string allocation per field
                     return {
-                        id: `field_${order}_${Date.now()}`,
+                        id: order,
                         element,
                         rect,
                         attributes,
                         context,
                         semantic,
-                        score,
-                        visible: true
+                        score
                     };
                 }
                 
@@ -162,28 +191,49 @@ class EnhancedBrowserAutomation:
                 }
                 
                 getNearbyText(element) {
-                    const texts = [];
                     const parent = element.parentElement;
-                    if (parent) {
-                        const textNodes = parent.querySelectorAll('*');
-                        textNodes.forEach(node => {
-                            if (node !== element && node.textContent.trim()) {
-                                texts.push(node.textContent.trim());
-                            }
-                        });
+                    if (!parent) return [];
+
+                    // Sibling fields share parents; reuse the subtree scan
+                    const cached = this.nearbyTextCache.get(parent);
+                    if (cached) return cached;
+
+                    // Walk text nodes directly with a character budget
+                    // instead of materializing every descendant element
+                    const texts = [];
+                    const seen = new Set();
+                    const walker = document.createTreeWalker(parent, NodeFilter.SHOW_TEXT);
+                    let chars = 0;
+                    let node;
+                    while ((node = walker.nextNode()) && chars < 256) {
+                        if (node.parentElement === element) continue;
+                        const text = node.nodeValue.trim();
+                        if (text && !seen.has(text)) {
+                            seen.add(text);
+                            texts.push(text);
+                            chars += text.length;
+                        }
                     }
+
+                    this.nearbyTextCache.set(parent, texts);
                     return texts;
                 }
                 
                 inferPurpose(element, attributes, context) {
-                    const searchText = [
+                    // Test sources in signal order and short-circuit: most
+                    // fields resolve from name/id alone, so the joined
+                    // nearby-text blob is only built as a last resort
+                    const sources = [
                         attributes.name, attributes.id, attributes.placeholder,
-                        context.label, ...context.nearbyText
-                    ].filter(Boolean).join(' ').toLowerCase();
-                    
-                    for (const [semantic, patterns] of Object.entries(this.semanticPatterns)) {
-                        for (const pattern of patterns) {
-                            if (pattern.test(searchText)) return semantic;
+                        context.label
+                    ];
+                    if (context.nearbyText.length) {
+                        sources.push(context.nearbyText.join(' '));
+                    }
+                    for (const source of sources) {
+                        if (!source) continue;
+                        for (const [semantic, regex] of Object.entries(this.semanticRegex)) {
+                            if (regex.test(source)) return semantic;
                         }
                     }
                     return 'unknown';
@@ -204,127 +254,382 @@ class EnhancedBrowserAutomation:
             
             window.DynamicFieldDetector = DynamicFieldDetector;
             """
-            
-            # Field Highlighter Script
-            field_highlighter_script = """
+
+_FIELD_HIGHLIGHTER_JS = """
             class FieldHighlighter {
                 constructor() {
                     this.highlights = new Map();
-                    this.styles = {
-                        email: { border: '#3b82f6', bg: 'rgba(59, 130, 246, 0.1)' },
-                        password: { border: '#ef4444', bg: 'rgba(239, 68, 68, 0.1)' },
-                        name: { border: '#10b981', bg: 'rgba(16, 185, 129, 0.1)' },
-                        departure: { border: '#f59e0b', bg: 'rgba(245, 158, 11, 0.1)' },
-                        destination: { border: '#8b5cf6', bg: 'rgba(139, 92, 246, 0.1)' },
-                        unknown: { border: '#9ca3af', bg: 'rgba(156, 163, 175, 0.1)' }
-                    };
+                    this.knownSemantics = new Set([
+                        'email', 'password', 'name', 'departure', 'destination'
+                    ]);
+                    this.installStylesheet();
+                    // All highlights live under one overlay div: body keeps
+                    // a single stable extra child no matter how many fields
+                    // are highlighted, so DOM-shape signatures stay put
+                    this.overlay = document.getElementById('mksk-hl-overlay');
+                    if (!this.overlay) {
+                        this.overlay = document.createElement('div');
+                        this.overlay.id = 'mksk-hl-overlay';
+                        document.body.appendChild(this.overlay);
+                    }
                 }
-                
+
+                installStylesheet() {
+                    // One-time <style> install: per-field work becomes a
+                    // class name plus four geometry properties instead of a
+                    // ~400-char inline cssText parse per highlight
+                    if (document.getElementById('mksk-hl-styles')) return;
+                    const sheet = document.createElement('style');
+                    sheet.id = 'mksk-hl-styles';
+                    sheet.textContent = `
+                        .mksk-hl { position: fixed; z-index: 10000; border: 2px solid; border-radius: 4px; pointer-events: none; transition: all 0.3s ease; }
+                        .mksk-hl-label { position: absolute; top: -25px; left: 0; color: white; padding: 2px 6px; border-radius: 3px; font-size: 12px; font-weight: bold; }
+                        .mksk-hl-email { border-color: #3b82f6; background: rgba(59, 130, 246, 0.1); }
+                        .mksk-hl-email > .mksk-hl-label { background: #3b82f6; }
+                        .mksk-hl-password { border-color: #ef4444; background: rgba(239, 68, 68, 0.1); }
+                        .mksk-hl-password > .mksk-hl-label { background: #ef4444; }
+                        .mksk-hl-name { border-color: #10b981; background: rgba(16, 185, 129, 0.1); }
+                        .mksk-hl-name > .mksk-hl-label { background: #10b981; }
+                        .mksk-hl-departure { border-color: #f59e0b; background: rgba(245, 158, 11, 0.1); }
+                        .mksk-hl-departure > .mksk-hl-label { background: #f59e0b; }
+                        .mksk-hl-destination { border-color: #8b5cf6; background: rgba(139, 92, 246, 0.1); }
+                        .mksk-hl-destination > .mksk-hl-label { background: #8b5cf6; }
+                        .mksk-hl-unknown { border-color: #9ca3af; background: rgba(156, 163, 175, 0.1); }
+                        .mksk-hl-unknown > .mksk-hl-label { background: #9ca3af; }
+                    `;
+                    document.head.appendChild(sheet);
+                }
+
+                semanticClass(semantic) {
+                    return 'mksk-hl mksk-hl-' +
+                        (this.knownSemantics.has(semantic) ? semantic : 'unknown');
+                }
+
+                setGeometry(highlight, rect) {
+                    highlight.style.left = rect.left + 'px';
+                    highlight.style.top = rect.top + 'px';
+                    highlight.style.width = rect.width + 'px';
+                    highlight.style.height = rect.height + 'px';
+                }
+
                 highlightFields(fields) {
-                    this.removeAllHighlights();
-                    fields.forEach(field => this.createHighlight(field));
+                    // Diff against the existing pool: update highlights in
+                    // place, create only new ones, remove only stragglers -
+                    // no per-detect destroy/create churn
+                    const present = new Set();
+                    fields.forEach(field => {
+                        present.add(field.id);
+                        const existing = this.highlights.get(field.id);
+                        if (existing) {
+                            this.updateHighlight(existing, field);
+                        } else {
+                            this.createHighlight(field);
+                        }
+                    });
+                    this.highlights.forEach((highlight, id) => {
+                        if (!present.has(id)) {
+                            highlight.remove();
+                            this.highlights.delete(id);
+                        }
+                    });
                 }
-                
+
+                updateHighlight(highlight, field) {
+                    highlight.className = this.semanticClass(field.semantic);
+                    this.setGeometry(highlight, field.rect);
+                    const label = highlight.firstChild;
+                    if (label) label.textContent = field.semantic;
+                }
+
                 createHighlight(field) {
-                    const style = this.styles[field.semantic] || this.styles.unknown;
                     const highlight = document.createElement('div');
-                    
-                    highlight.style.cssText = `
-                        position: fixed;
-                        z-index: 10000;
-                        left: ${field.rect.left}px;
-                        top: ${field.rect.top}px;
-                        width: ${field.rect.width}px;
-                        height: ${field.rect.height}px;
-                        border: 2px solid ${style.border};
-                        background: ${style.bg};
-                        border-radius: 4px;
-                        pointer-events: none;
-                        transition: all 0.3s ease;
-                    `;
-                    
+                    highlight.className = this.semanticClass(field.semantic);
+                    this.setGeometry(highlight, field.rect);
+
                     // Add label
                     const label = document.createElement('div');
+                    label.className = 'mksk-hl-label';
                     label.textContent = field.semantic;
-                    label.style.cssText = `
-                        position: absolute;
-                        top: -25px;
-                        left: 0;
-                        background: ${style.border};
-                        color: white;
-                        padding: 2px 6px;
-                        border-radius: 3px;
-                        font-size: 12px;
-                        font-weight: bold;
-                    `;
                     highlight.appendChild(label);
-                    
-                    document.body.appendChild(highlight);
+
+                    this.overlay.appendChild(highlight);
                     this.highlights.set(field.id, highlight);
                 }
-                
+
                 removeAllHighlights() {
                     this.highlights.forEach(highlight => highlight.remove());
                     this.highlights.clear();
                 }
             }
-            
+
             window.FieldHighlighter = FieldHighlighter;
             """
+
+# Fused detect -> fill -> click pipeline: the whole flight-search flow runs
+# in one JS turn instead of a CDP round-trip per stage
+_SMART_SEARCH_JS = """
+            window.smartSearchFlights = async (fieldMap, required) => {
+                const detector = new window.DynamicFieldDetector();
+                const fields = detector.detectAllFields();
+
+                // Fields are ranked by score, so the first per semantic wins
+                const bySemantic = new Map();
+                fields.forEach(field => {
+                    if (!bySemantic.has(field.semantic)) bySemantic.set(field.semantic, field);
+                });
+
+                const filled = {};
+                for (const [key, value] of Object.entries(fieldMap)) {
+                    const field = bySemantic.get(key);
+                    const element = field && window.__fieldRefs.get(field.id);
+                    if (element) {
+                        element.focus();
+                        element.value = value;
+                        element.dispatchEvent(new Event('input', { bubbles: true }));
+                        element.dispatchEvent(new Event('change', { bubbles: true }));
+                        filled[key] = true;
+                    } else {
+                        filled[key] = false;
+                    }
+                }
+
+                // Never submit a half-filled form: if a required field the
+                // caller supplied data for did not fill, stop before the
+                // click so Python can report the failure
+                const missing = (required || []).filter(
+                    key => fieldMap[key] !== undefined && !filled[key]
+                );
+                if (missing.length) return { filled, clicked: false };
+
+                const button = document.querySelector(
+                    'button[type="submit"], input[type="submit"], .search-button, .btn-search, #search-btn'
+                ) || [...document.querySelectorAll('button')].find(b => /search|find|go/i.test(b.textContent));
+                if (button) button.click();
+
+                return { filled, clicked: !!button };
+            };
+            """
+
+_DETECTOR_JS = _FIELD_DETECTION_JS + _FIELD_HIGHLIGHTER_JS + _SMART_SEARCH_JS
+
+class EnhancedBrowserAutomation:
+    def __init__(self):
+        self.detected_fields = []
+        self.field_mappings = {}
+        self.detection_enabled = True
+        self._injected_pages = weakref.WeakSet()
+        self._injected_contexts = weakref.WeakSet()
+        self._by_semantic = {}
+        self._by_semantic_substr = []
+        # Detection results memoized by (url, dom signature); complements
+        # the in-page MutationObserver cache by also skipping the CDP
+        # round-trip when nothing changed
+        self._detection_cache = {}
+        self._watched_pages = weakref.WeakSet()
+        
+    async def detect_and_highlight_fields(self, page: Page) -> List[Dict]:
+        """Detect all fields on the page and highlight them"""
+        
+        try:
+            # Inject field detection scripts
+            await self.inject_field_detection_scripts(page)
+
+            # Cheap DOM signature: if the url and rough shape of the page
+            # are unchanged, reuse the previous detection result. The
+            # highlighter's own overlay is excluded so drawing highlights
+            # does not perturb the signature
+            signature = await page.evaluate(
+                "() => (document.body.childElementCount"
+                " - (document.getElementById('mksk-hl-overlay') ? 1 : 0))"
+                " + ':' + document.forms.length"
+            )
+            cache_key = (page.url, signature)
+            cached = self._detection_cache.get(cache_key)
+            if cached is not None:
+                self.detected_fields = cached
+                self._index_fields(cached)
+                return cached
+            if page not in self._watched_pages:
+                page.on("framenavigated", lambda frame: self._detection_cache.clear())
+                self._watched_pages.add(page)
+
+            # Detect fields using the enhanced system
+            detected_fields = await page.evaluate("""
+                () => {
+                    if (!window.DynamicFieldDetector || !window.FieldHighlighter) {
+                        throw new Error('Field detection scripts not loaded');
+                    }
+                    
+                    const detector = new window.DynamicFieldDetector();
+                    // One persistent instance: the highlight pool lives in
+                    // its Map, so a fresh instance per evaluate would
+                    // recreate every div and orphan the previous batch
+                    const highlighter = window.__fieldHighlighter =
+                        window.__fieldHighlighter || new window.FieldHighlighter();
+
+                    const fields = detector.detectAllFields();
+                    highlighter.highlightFields(fields);
+                    
+                    // Return serializable field data. Trim nearbyText so the
+                    // payload marshalled over CDP stays compact; scoring
+                    // already ran against the full text in-page
+                    return fields.map(field => ({
+                        id: field.id,
+                        semantic: field.semantic,
+                        score: field.score,
+                        attributes: field.attributes,
+                        context: {
+                            label: field.context.label,
+                            nearbyText: field.context.nearbyText.slice(0, 3)
+                        },
+                        rect: {
+                            x: field.rect.x,
+                            y: field.rect.y,
+                            width: field.rect.width,
+                            height: field.rect.height
+                        }
+                    }));
+                }
+            """)
             
-            # Inject both scripts
-            await page.add_script_tag(content=field_detection_script)
-            await page.add_script_tag(content=field_highlighter_script)
+            self.detected_fields = detected_fields
+            self._index_fields(detected_fields)
+            self._detection_cache[cache_key] = detected_fields
+            logger.info("Detected %d fields on page", len(detected_fields))
+            return detected_fields
             
         except Exception as e:
-            logger.error(f"Failed to inject field detection scripts: {e}")
-            raise
+            logger.error("Field detection failed: %s", e)
+            return []
     
+    async def inject_field_detection_scripts(self, page: Page):
+        """Ensure the field detection and highlighting JS is on the page"""
+
+        if page in self._injected_pages:
+            return
+
+        try:
+            # Register the scripts once per context so every new document
+            # already has the classes defined, instead of re-uploading the
+            # multi-KB source across CDP on each detection
+            context = page.context
+            if context not in self._injected_contexts:
+                await context.add_init_script(_DETECTOR_JS)
+                self._injected_contexts.add(context)
+
+            # The current document may predate the init script; load it there
+            already_loaded = await page.evaluate("() => !!window.DynamicFieldDetector")
+            if not already_loaded:
+                await page.add_script_tag(content=_DETECTOR_JS)
+
+            self._injected_pages.add(page)
+
+        except Exception as e:
+            logger.error("Failed to inject field detection scripts: %s", e)
+            raise
+
     async def smart_field_fill(self, page: Page, field_data: Dict[str, str]) -> Dict[str, bool]:
         """Fill fields using smart field mapping"""
-        
+
         if not self.detected_fields:
             await self.detect_and_highlight_fields(page)
-        
+
         results = {}
-        
+
+        # Resolve the best field per key in Python, then perform every fill
+        # in a single page.evaluate - one CDP round-trip instead of one per
+        # field
+        payload = []
         for data_key, data_value in field_data.items():
-            success = await self.fill_field_by_semantic_type(page, data_key, data_value)
-            results[data_key] = success
-            
+            best_field = self.find_best_field(data_key)
+            if best_field is None:
+                logger.warning("No matching field found for semantic type: %s", data_key)
+                results[data_key] = False
+            else:
+                payload.append({'key': data_key, 'field': best_field, 'value': data_value})
+
+        if not payload:
+            return results
+
+        try:
+            outcomes = await page.evaluate(_BATCH_FILL_JS, payload)
+            for item, success in zip(payload, outcomes):
+                results[item['key']] = bool(success)
+                if success:
+                    logger.info("Successfully filled %s field with value: %s", item['key'], item['value'])
+                else:
+                    logger.warning("Failed to fill %s field", item['key'])
+        except Exception as e:
+            logger.error("Batch field fill failed, retrying individually: %s", e)
+            # Independent fills: overlap their CDP round-trips instead of
+            # awaiting each one back to back
+            outcomes = await asyncio.gather(
+                *(self.fill_field_by_semantic_type(page, item['key'], item['value'])
+                  for item in payload),
+                return_exceptions=True
+            )
+            for item, success in zip(payload, outcomes):
+                results[item['key']] = success is True
+
         return results
-    
+
+    def _index_fields(self, fields: List[Dict]):
+        """Build the semantic -> fields index, highest score first, and
+        precompute the casefolded text used for confidence scoring"""
+        self._by_semantic = {}
+        for field in fields:
+            context = field.get('context', {})
+            field['_ctx_lower'] = (
+                (context.get('label') or '') + ' ' +
+                ' '.join(context.get('nearbyText', [])) + ' ' +
+                (field.get('attributes', {}).get('placeholder') or '')
+            ).casefold()
+            field['_sem_lower'] = field['semantic'].casefold()
+            self._by_semantic.setdefault(field['semantic'], []).append(field)
+        for group in self._by_semantic.values():
+            group.sort(key=lambda x: -x['score'])
+        # Pre-lowercased pairs for the partial-match fallback, so it makes
+        # one pass with no per-call casefolding
+        self._by_semantic_substr = [
+            (semantic.casefold(), group)
+            for semantic, group in self._by_semantic.items()
+        ]
+
+    def find_best_field(self, semantic_type: str) -> Optional[Dict]:
+        """Find the highest scored detected field for a semantic type"""
+
+        # Exact semantic match is an O(1) lookup into the pre-sorted index
+        exact = self._by_semantic.get(semantic_type)
+        if exact:
+            return exact[0]
+
+        # Fallback to partial matching across the (few) known semantics,
+        # using the pre-lowercased index and each group's pre-sorted head
+        semantic_lower = semantic_type.casefold()
+        best = None
+        for known_semantic, group in self._by_semantic_substr:
+            if semantic_lower in known_semantic:
+                if best is None or group[0]['score'] > best['score']:
+                    best = group[0]
+        return best
+
     async def fill_field_by_semantic_type(self, page: Page, semantic_type: str, value: str) -> bool:
         """Fill a field based on its semantic type"""
-        
-        # Find the best matching field
-        matching_fields = [
-            field for field in self.detected_fields 
-            if field['semantic'] == semantic_type
-        ]
-        
-        if not matching_fields:
-            # Fallback to partial matching
-            matching_fields = [
-                field for field in self.detected_fields
-                if semantic_type.lower() in field['semantic'].lower()
-            ]
-        
-        if not matching_fields:
-            logger.warning(f"No matching field found for semantic type: {semantic_type}")
+
+        best_field = self.find_best_field(semantic_type)
+        if best_field is None:
+            logger.warning("No matching field found for semantic type: %s", semantic_type)
             return False
-        
-        # Use the highest scored field
-        best_field = max(matching_fields, key=lambda x: x['score'])
-        
+
         try:
             # Fill the field using multiple strategies
             success = await page.evaluate("""
                 (fieldData, value) => {
-                    // Find element by attributes
-                    let element = null;
-                    
-                    if (fieldData.attributes.id) {
+                    // Use the detector's live reference; fall back to
+                    // attribute queries only for stale refs
+                    let element = (window.__fieldRefs && window.__fieldRefs.get(fieldData.id)) || null;
+
+                    if (!element && fieldData.attributes.id) {
                         element = document.getElementById(fieldData.attributes.id);
                     }
                     
@@ -350,14 +655,14 @@ class EnhancedBrowserAutomation:
             """, best_field, value)
             
             if success:
-                logger.info(f"Successfully filled {semantic_type} field with value: {value}")
+                logger.info("Successfully filled %s field with value: %s", semantic_type, value)
             else:
-                logger.warning(f"Failed to fill {semantic_type} field")
+                logger.warning("Failed to fill %s field", semantic_type)
                 
             return success
             
         except Exception as e:
-            logger.error(f"Error filling field {semantic_type}: {e}")
+            logger.error("Error filling field %s: %s", semantic_type, e)
             return False
     
     async def remove_highlights(self, page: Page):
@@ -365,14 +670,15 @@ class EnhancedBrowserAutomation:
         try:
             await page.evaluate("""
                 () => {
-                    if (window.FieldHighlighter) {
-                        const highlighter = new window.FieldHighlighter();
-                        highlighter.removeAllHighlights();
+                    // Only the persistent instance holds the live pool; a
+                    // fresh instance would have nothing to remove
+                    if (window.__fieldHighlighter) {
+                        window.__fieldHighlighter.removeAllHighlights();
                     }
                 }
             """)
         except Exception as e:
-            logger.error(f"Error removing highlights: {e}")
+            logger.error("Error removing highlights: %s", e)
     
     async def get_field_suggestions(self, page: Page, user_data: Dict[str, str]) -> Dict[str, List[Dict]]:
         """Get suggestions for field mappings based on user data"""
@@ -401,27 +707,31 @@ class EnhancedBrowserAutomation:
     
     def calculate_mapping_confidence(self, data_key: str, field: Dict) -> float:
         """Calculate confidence score for field mapping"""
-        
+
         base_score = field['score'] / 100.0  # Normalize to 0-1
-        
+
+        # Casefold the key once; the field-side strings were casefolded at
+        # detection time in _index_fields
+        data_key_lower = data_key.casefold()
+        semantic_lower = field.get('_sem_lower') or field['semantic'].casefold()
+
         # Semantic matching bonus
         semantic_bonus = 0
-        if data_key.lower() == field['semantic'].lower():
+        if data_key_lower == semantic_lower:
             semantic_bonus = 0.5
-        elif data_key.lower() in field['semantic'].lower():
+        elif data_key_lower in semantic_lower:
             semantic_bonus = 0.3
-        
+
         # Context matching bonus
-        context_bonus = 0
-        context_text = (
-            field['context'].get('label', '') + ' ' +
-            ' '.join(field['context'].get('nearbyText', [])) + ' ' +
-            field['attributes'].get('placeholder', '')
-        ).lower()
-        
-        if data_key.lower() in context_text:
-            context_bonus = 0.2
-        
+        context_text = field.get('_ctx_lower')
+        if context_text is None:
+            context_text = (
+                field['context'].get('label', '') + ' ' +
+                ' '.join(field['context'].get('nearbyText', [])) + ' ' +
+                field['attributes'].get('placeholder', '')
+            ).casefold()
+        context_bonus = 0.2 if data_key_lower in context_text else 0
+
         return min(1.0, base_score + semantic_bonus + context_bonus)
 
 
@@ -432,10 +742,6 @@ class SmartFlightSearchAutomation(EnhancedBrowserAutomation):
         """Enhanced flight search using dynamic field detection"""
         
         try:
-            # Detect and highlight all fields
-            fields = await self.detect_and_highlight_fields(page)
-            logger.info(f"Detected {len(fields)} fields on the page")
-            
             # Map flight data to semantic types
             field_mapping = {
                 'departure': flight_data.get('from', ''),
@@ -444,67 +750,77 @@ class SmartFlightSearchAutomation(EnhancedBrowserAutomation):
                 'email': flight_data.get('email', ''),
                 'name': flight_data.get('passenger_name', '')
             }
-            
+
             # Filter out empty values
             field_mapping = {k: v for k, v in field_mapping.items() if v}
-            
-            # Fill fields using smart mapping
-            results = await self.smart_field_fill(page, field_mapping)
-            
-            # Check if all required fields were filled
+
             required_fields = ['departure', 'destination']
+
+            # Detect, fill, and click in one fused page.evaluate - a single
+            # CDP round-trip for the whole pipeline instead of one per stage.
+            # The required list rides along so the in-page click is skipped
+            # when a required fill fails
+            await self.inject_field_detection_scripts(page)
+            outcome = await page.evaluate(
+                "(args) => window.smartSearchFlights(args.fieldMap, args.required)",
+                {'fieldMap': field_mapping, 'required': required_fields}
+            )
+            filled = outcome.get('filled', {})
+
+            # Check if all required fields were filled
             all_required_filled = all(
-                results.get(field, False) for field in required_fields
+                filled.get(field, False) for field in required_fields
                 if field_mapping.get(field)  # Only check if data exists
             )
-            
-            if all_required_filled:
-                # Look for and click search button
-                search_clicked = await self.click_search_button(page)
-                if search_clicked:
-                    logger.info("Flight search initiated successfully")
-                    return True
-                else:
-                    logger.warning("Fields filled but search button not found")
-                    return False
-            else:
+
+            if not all_required_filled:
                 failed_fields = [
-                    field for field in required_fields 
-                    if field_mapping.get(field) and not results.get(field, False)
+                    field for field in required_fields
+                    if field_mapping.get(field) and not filled.get(field, False)
                 ]
-                logger.error(f"Failed to fill required fields: {failed_fields}")
+                logger.error("Failed to fill required fields: %s", failed_fields)
                 return False
-                
+
+            if outcome.get('clicked'):
+                logger.info("Flight search initiated successfully")
+                return True
+
+            # The in-page button scan came up empty; fall back to the
+            # Playwright locator strategies before giving up
+            if await self.click_search_button(page):
+                logger.info("Flight search initiated successfully")
+                return True
+
+            logger.warning("Fields filled but search button not found")
+            return False
+
         except Exception as e:
-            logger.error(f"Flight search automation error: {e}")
+            logger.error("Flight search automation error: %s", e)
             return False
     
     async def click_search_button(self, page: Page) -> bool:
-        """Find and click the search button using multiple strategies"""
-        
-        search_selectors = [
+        """Find and click the search button using one combined locator"""
+
+        # A single CSS union plus a role lookup lets Playwright match any
+        # candidate in one DOM scan, instead of eleven sequential
+        # wait_for_selector windows of up to 2s each (the old
+        # button:contains() entries weren't even valid CSS and always
+        # burned their timeout)
+        css_union = ", ".join([
             'button[type="submit"]',
             'input[type="submit"]',
-            'button:has-text("Search")',
-            'button:has-text("Find")',
-            'button:has-text("Go")',
-            '[role="button"]:has-text("Search")',
             '.search-button',
             '.btn-search',
-            '#search-btn',
-            'button:contains("Search")',
-            'button:contains("Find")'
-        ]
-        
-        for selector in search_selectors:
-            try:
-                element = await page.wait_for_selector(selector, timeout=2000)
-                if element:
-                    await element.click()
-                    logger.info(f"Clicked search button: {selector}")
-                    return True
-            except Exception:
-                continue
-        
-        logger.warning("No search button found with any selector")
-        return False
+            '#search-btn'
+        ])
+        locator = page.locator(css_union).or_(
+            page.get_by_role("button", name=re.compile(r"Search|Find|Go", re.IGNORECASE))
+        )
+
+        try:
+            await locator.first.click(timeout=5000)
+            logger.info("Clicked search button")
+            return True
+        except Exception:
+            logger.warning("No search button found with any selector")
+            return False
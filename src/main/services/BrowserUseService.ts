@@ -27,11 +27,20 @@ interface PythonBridgeMessage {
   timestamp?: string;
 }
 
+interface MsgpackCodec {
+  encode(value: unknown): Uint8Array;
+  decode(buffer: Uint8Array): unknown;
+}
+
 export class BrowserUseService implements IBrowserEngine {
   private pythonProcess: ChildProcess | null = null;
   private logger: Logger;
   private _isRunning: boolean = false;
   private config: BrowserEngineConfig;
+  private ipcMode: 'msgpack' | 'json' = 'json';
+  private msgpack: MsgpackCodec | null = null;
+  private pendingBlob: { id: string; mime: string; len: number } | null = null;
+  private blobStore: Map<string, Buffer> = new Map();
 
   constructor(config: BrowserEngineConfig = {}) {
     this.logger = new Logger();
@@ -54,6 +63,19 @@ export class BrowserUseService implements IBrowserEngine {
         await this.cleanup();
       }
 
+      // Prefer length-prefixed msgpack framing over JSON lines - binary
+      // frames are much cheaper to encode/decode for screenshot payloads.
+      // BRIDGE_IPC=json forces the old text protocol for debugging.
+      if (process.env.BRIDGE_IPC !== 'json') {
+        try {
+          this.msgpack = await import('@msgpack/msgpack');
+          this.ipcMode = 'msgpack';
+        } catch {
+          this.logger.warn('@msgpack/msgpack not available, falling back to JSON IPC');
+          this.ipcMode = 'json';
+        }
+      }
+
       // Start Python bridge process
       await this.startPythonBridge();
       
@@ -97,7 +119,8 @@ export class BrowserUseService implements IBrowserEngine {
           env: {
             ...process.env,
             PYTHONPATH: path.join(process.cwd(), 'python-bridge'),
-            PYTHONUNBUFFERED: '1'
+            PYTHONUNBUFFERED: '1',
+            BRIDGE_IPC: this.ipcMode
           }
         });
 
@@ -121,23 +144,54 @@ export class BrowserUseService implements IBrowserEngine {
         });
 
         // Handle stdout messages
-        let buffer = '';
-        this.pythonProcess.stdout?.on('data', (data) => {
-          buffer += data.toString();
-          const lines = buffer.split('\n');
-          buffer = lines.pop() || ''; // Keep incomplete line in buffer
-
-          for (const line of lines) {
-            if (line.trim()) {
+        if (this.ipcMode === 'msgpack') {
+          // Length-prefixed msgpack frames: [4-byte LE length][payload]
+          let frameBuffer = Buffer.alloc(0);
+          this.pythonProcess.stdout?.on('data', (data: Buffer) => {
+            frameBuffer = frameBuffer.length ? Buffer.concat([frameBuffer, data]) : data;
+            while (frameBuffer.length >= 4) {
+              const frameLength = frameBuffer.readUInt32LE(0);
+              if (frameBuffer.length < 4 + frameLength) break;
+              const payload = frameBuffer.subarray(4, 4 + frameLength);
+              frameBuffer = frameBuffer.subarray(4 + frameLength);
               try {
-                const message: PythonBridgeMessage = JSON.parse(line.trim());
+                // A blob header announces that the next frame is raw bytes
+                if (this.pendingBlob) {
+                  this.blobStore.set(this.pendingBlob.id, Buffer.from(payload));
+                  this.pendingBlob = null;
+                  continue;
+                }
+                const message = this.msgpack!.decode(payload) as PythonBridgeMessage;
+                if (message.type === 'blob') {
+                  this.pendingBlob = message as any;
+                  continue;
+                }
+                this.resolveBlobReferences(message);
                 this.handlePythonMessage(message);
               } catch (error) {
-                this.logger.warn('Failed to parse Python message:', line);
+                this.logger.warn('Failed to decode Python msgpack frame:', error);
               }
             }
-          }
-        });
+          });
+        } else {
+          let buffer = '';
+          this.pythonProcess.stdout?.on('data', (data) => {
+            buffer += data.toString();
+            const lines = buffer.split('\n');
+            buffer = lines.pop() || ''; // Keep incomplete line in buffer
+
+            for (const line of lines) {
+              if (line.trim()) {
+                try {
+                  const message: PythonBridgeMessage = JSON.parse(line.trim());
+                  this.handlePythonMessage(message);
+                } catch (error) {
+                  this.logger.warn('Failed to parse Python message:', line);
+                }
+              }
+            }
+          });
+        }
 
         // Wait for ready signal
         const timeout = setTimeout(() => {
@@ -161,6 +215,18 @@ export class BrowserUseService implements IBrowserEngine {
     });
   }
 
+  private resolveBlobReferences(message: PythonBridgeMessage): void {
+    // Screenshots arrive as raw blob frames referenced by id; swap the ids
+    // back to their Buffers before the result is handed to callers
+    const screenshots = message.data?.screenshots;
+    if (Array.isArray(screenshots) && this.blobStore.size > 0) {
+      message.data.screenshots = screenshots.map((shot: any) =>
+        typeof shot === 'string' && this.blobStore.has(shot) ? this.blobStore.get(shot) : shot
+      );
+      this.blobStore.clear();
+    }
+  }
+
   private handlePythonMessage(message: PythonBridgeMessage): void {
     this.logger.info('Received Python message:', message.type);
 
@@ -179,6 +245,9 @@ export class BrowserUseService implements IBrowserEngine {
       case 'test_error':
         // These will be handled by pending promises
         break;
+      case 'progress':
+        this.logger.info('Python bridge progress:', message.data?.step);
+        break;
       case 'info':
         this.logger.info('Python bridge info:', message.message);
         break;
@@ -588,7 +657,14 @@ STOP OVERTHINKING - JUST EXECUTE THE STEPS!`;
 
       try {
         // Send message
-        this.pythonProcess.stdin.write(JSON.stringify(messageWithId) + '\n');
+        if (this.ipcMode === 'msgpack') {
+          const payload = this.msgpack!.encode(messageWithId);
+          const header = Buffer.alloc(4);
+          header.writeUInt32LE(payload.length, 0);
+          this.pythonProcess.stdin.write(Buffer.concat([header, Buffer.from(payload.buffer, payload.byteOffset, payload.byteLength)]));
+        } else {
+          this.pythonProcess.stdin.write(JSON.stringify(messageWithId) + '\n');
+        }
 
         // Set up response handler with timeout (add buffer for Python processing)
         const pythonTimeout = message.data?.timeout || 60;